@@ -5,6 +5,7 @@ benchmark_disjointset.py
 This script benchmarks the performance of the two disjoint-set implementations
 provided by the C extension module "disjointset". It compares the performance of:
   - StaticDisjointSet (obtained by calling DisjointSet(n))
+  - StaticDisjointSet driven through its bulk run_ops() API
   - DynamicDisjointSet (obtained by calling DisjointSet(None))
 
 Five workload scenarios are simulated:
@@ -16,55 +17,73 @@ Five workload scenarios are simulated:
 
 Operations (union and find) are generated using random integers in the range [0, n-1].
 Both implementations are benchmarked using the identical sequence of operations per scenario.
-The results are presented as a grouped bar chart using Matplotlib.
+The results are presented as a grouped bar chart using Matplotlib, which is
+only imported when plotting; pass --no-plot to skip the chart.
 """
 
+import argparse
 import time
-import random
-import matplotlib.pyplot as plt
 import numpy as np
-import disjointset  # Imports the C extension module
+import fastdisjointset  # Imports the C extension module
 
 
-def generate_workload(union_ratio, n, total_ops):
+def generate_workloads(scenarios, n, total_ops, rng):
     """
-    Creates a list of operations for the workload.
-    Each operation is a tuple:
-      ("union", a, b)  or  ("find", a)
-    where 'union_ratio' is the fraction of operations that are unions.
+    Generates the operations for every scenario from one shared stream.
+    Returns a dict mapping each scenario name to a tuple of:
+      unions_a, unions_b  int32 operands of the union operations
+      finds_a             int32 operands of the find operations
+      ops                 the same operations packed for run_ops(): a tuple
+                          (codes, a, b) holding the unions followed by the finds
+    scenarios maps names to union ratios, the probability that an operation
+    is a union. Operands for all scenarios are drawn in a single bulk call
+    and each scenario takes its own slice, partitioned by a random union
+    mask so the union:find mix is preserved without interleaving.
     """
-    union_count = int(total_ops * union_ratio)
-    find_count = total_ops - union_count
-    ops = []
-
-    # Generate union operations.
-    for _ in range(union_count):
-        a = random.randint(0, n - 1)
-        b = random.randint(0, n - 1)
-        ops.append(('union', a, b))
-
-    # Generate find operations.
-    for _ in range(find_count):
-        a = random.randint(0, n - 1)
-        ops.append(('find', a))
-
-    # Shuffle to mix the operations.
-    random.shuffle(ops)
-    return ops
-
-
-def run_workload(ds, operations):
+    count = len(scenarios) * total_ops
+    all_a = rng.integers(0, n, count, dtype=np.int32)
+    all_b = rng.integers(0, n, count, dtype=np.int32)
+    all_r = rng.random(count)
+    workloads = {}
+    for k, (scenario, union_ratio) in enumerate(scenarios.items()):
+        part = slice(k * total_ops, (k + 1) * total_ops)
+        a = all_a[part]
+        b = all_b[part]
+        is_union = all_r[part] < union_ratio
+        unions_a, unions_b, finds_a = a[is_union], b[is_union], a[~is_union]
+        codes = np.repeat(
+            np.array([1, 0], dtype=np.int8), [len(unions_a), len(finds_a)]
+        )
+        ops = (
+            codes,
+            np.concatenate((unions_a, finds_a)),
+            np.concatenate((unions_b, finds_a)),
+        )
+        workloads[scenario] = (unions_a, unions_b, finds_a, ops)
+    return workloads
+
+
+def run_workload(ds, unions_a, unions_b, finds_a):
     """
-    Executes the list of operations on the given disjoint-set instance ds.
+    Executes the operations on the given disjoint-set instance ds: all unions
+    first and then all finds, each in its own branch-free loop.
     """
-    for op in operations:
-        if op[0] == 'union':
-            ds.union(op[1], op[2])
-        elif op[0] == 'find':
-            ds.find(op[1])
+    # Bind the methods once so the loops skip the per-op attribute lookup.
+    union = ds.union
+    for x, y in zip(unions_a.tolist(), unions_b.tolist()):
+        union(x, y)
+    find = ds.find
+    for x in finds_a.tolist():
+        find(x)
 
 
 def main():
+    parser = argparse.ArgumentParser(description='Benchmark fastdisjointset.')
+    parser.add_argument(
+        '--no-plot', action='store_true', help='skip plotting the results'
+    )
+    args = parser.parse_args()
+
     # Configuration parameters.
     n = 10000  # Number of elements (for static variant)
     total_ops = 100000  # Total number of operations in each workload
@@ -78,40 +97,50 @@ def main():
         'Find Heavy': 0.001,  # 0.1% union, 99.9% find
     }
 
-    # Define the two variants via factory lambdas:
+    # Define the variants via factory lambdas and whether to use run_ops():
     # - Static: pass an integer n to DisjointSet() to get a StaticDisjointSet.
+    # - Static run_ops: the same, but applying the whole workload in one
+    #   run_ops() call instead of one method call per operation.
     # - Dynamic: pass None to DisjointSet() to get a DynamicDisjointSet.
     variants = {
-        'Static': lambda: disjointset.DisjointSet(n),
-        'Dynamic': lambda: disjointset.DisjointSet(None),
+        'Static': (lambda: fastdisjointset.DisjointSet(n), False),
+        'Static run_ops': (lambda: fastdisjointset.DisjointSet(n), True),
+        'Dynamic': (lambda: fastdisjointset.DisjointSet(None), False),
     }
 
     # Fix the random seed for reproducibility.
-    random.seed(42)
+    rng = np.random.default_rng(42)
 
     # Dictionary to collect benchmark results.
     # results[scenario][variant] = duration in seconds.
     results = {scenario: {} for scenario in scenarios}
 
+    # Generate operations for every scenario up front.
+    workloads = generate_workloads(scenarios, n, total_ops, rng)
+
     print('Benchmarking StaticDisjointSet vs DynamicDisjointSet')
-    for scenario, union_ratio in scenarios.items():
+    for scenario, (unions_a, unions_b, finds_a, ops) in workloads.items():
         print(f'\nScenario: {scenario}')
-        # Generate operations for the current scenario.
-        ops = generate_workload(union_ratio, n, total_ops)
 
-        for variant_name, create_fn in variants.items():
+        for variant_name, (create_fn, bulk) in variants.items():
             ds = create_fn()
             start = time.perf_counter()
-            run_workload(ds, ops)
+            if bulk:
+                ds.run_ops(*ops)
+            else:
+                run_workload(ds, unions_a, unions_b, finds_a)
             duration = time.perf_counter() - start
             results[scenario][variant_name] = duration
-            print(f'  {variant_name:8s}: {duration:.4f} seconds')
+            print(f'  {variant_name:14s}: {duration:.4f} seconds')
 
     # Plot the benchmark results.
-    plot_results(results)
+    if not args.no_plot:
+        plot_results(results)
 
 
 def plot_results(results):
+    import matplotlib.pyplot as plt
+
     # Extract the list of scenarios and variant names.
     scenarios = list(results.keys())
     variant_names = list(next(iter(results.values())).keys())
@@ -126,7 +155,7 @@ def plot_results(results):
 
     # Set up the grouped bar chart.
     x = np.arange(num_scenarios)  # Scenario positions on x-axis
-    width = 0.35  # Width of each bar; adjust if more variants are added
+    width = 0.8 / num_variants  # Width of each bar
 
     fig, ax = plt.subplots(figsize=(10, 6))
     for i, variant in enumerate(variant_names):
@@ -1,46 +1,96 @@
 #!/usr/bin/env python3
+import argparse
 import time
-import random
-import matplotlib.pyplot as plt
+from array import array
 import numpy as np
 
+try:
+    from numba import njit
+
+    HAVE_NUMBA = True
+except ImportError:
+    # The JIT variants are left out of the benchmark without Numba. The
+    # stand-in decorator only lets their kernels be defined.
+    def njit(**options):
+        return lambda func: func
+
+    HAVE_NUMBA = False
+
 ##############################
 # Union‐Find Implementations #
 ##############################
 
 
 class UnionFindFull:
-    """Union‐Find with full (recursive) path compression."""
+    """Union‐Find with full path compression (two passes: find the root, then relink)."""
 
     def __init__(self, n):
-        self.parent = list(range(n))
-        self.rank = [0] * n
+        # Templates copied in by reset() so it allocates nothing.
+        self._identity = array('i', range(n))
+        self._zeros = bytes(n)
+        self.parent = array('i', self._identity)
+        self.rank = bytearray(self._zeros)
+
+    def reset(self):
+        self.parent[:] = self._identity
+        self.rank[:] = self._zeros
 
     def find(self, x):
-        if self.parent[x] != x:
-            self.parent[x] = self.find(self.parent[x])
-        return self.parent[x]
+        root = x
+        while self.parent[root] != root:
+            root = self.parent[root]
+        # Point every node on the path directly at the root.
+        while self.parent[x] != root:
+            nxt = self.parent[x]
+            self.parent[x] = root
+            x = nxt
+        return root
 
     def union(self, x, y):
-        rootX = self.find(x)
-        rootY = self.find(y)
+        parent = self.parent
+        # Nodes that share an immediate parent are already in the same set.
+        if parent[x] == parent[y]:
+            return
+        # Inline both two-pass walks so each parent load is reused.
+        rootX = x
+        while parent[rootX] != rootX:
+            rootX = parent[rootX]
+        while parent[x] != rootX:
+            nxt = parent[x]
+            parent[x] = rootX
+            x = nxt
+        rootY = y
+        while parent[rootY] != rootY:
+            rootY = parent[rootY]
+        while parent[y] != rootY:
+            nxt = parent[y]
+            parent[y] = rootY
+            y = nxt
         if rootX == rootY:
             return
-        if self.rank[rootX] < self.rank[rootY]:
-            self.parent[rootX] = rootY
-        elif self.rank[rootX] > self.rank[rootY]:
-            self.parent[rootY] = rootX
+        rank = self.rank
+        if rank[rootX] < rank[rootY]:
+            parent[rootX] = rootY
+        elif rank[rootX] > rank[rootY]:
+            parent[rootY] = rootX
         else:
-            self.parent[rootY] = rootX
-            self.rank[rootX] += 1
+            parent[rootY] = rootX
+            rank[rootX] += 1
 
 
 class UnionFindHalving:
     """Union‐Find with path halving (iteratively makes nodes point to their grandparent)."""
 
     def __init__(self, n):
-        self.parent = list(range(n))
-        self.rank = [0] * n
+        # Templates copied in by reset() so it allocates nothing.
+        self._identity = array('i', range(n))
+        self._zeros = bytes(n)
+        self.parent = array('i', self._identity)
+        self.rank = bytearray(self._zeros)
+
+    def reset(self):
+        self.parent[:] = self._identity
+        self.rank[:] = self._zeros
 
     def find(self, x):
         while self.parent[x] != x:
@@ -50,25 +100,42 @@ class UnionFindHalving:
         return x
 
     def union(self, x, y):
-        rootX = self.find(x)
-        rootY = self.find(y)
-        if rootX == rootY:
+        parent = self.parent
+        # Nodes that share an immediate parent are already in the same set.
+        if parent[x] == parent[y]:
+            return
+        # Inline both path-halving walks; x and y end at their roots.
+        while parent[x] != x:
+            parent[x] = parent[parent[x]]
+            x = parent[x]
+        while parent[y] != y:
+            parent[y] = parent[parent[y]]
+            y = parent[y]
+        if x == y:
             return
-        if self.rank[rootX] < self.rank[rootY]:
-            self.parent[rootX] = rootY
-        elif self.rank[rootX] > self.rank[rootY]:
-            self.parent[rootY] = rootX
+        rank = self.rank
+        if rank[x] < rank[y]:
+            parent[x] = y
+        elif rank[x] > rank[y]:
+            parent[y] = x
         else:
-            self.parent[rootY] = rootX
-            self.rank[rootX] += 1
+            parent[y] = x
+            rank[x] += 1
 
 
 class UnionFindSplitting:
     """Union‐Find with path splitting (each node along the find path points to its grandparent)."""
 
     def __init__(self, n):
-        self.parent = list(range(n))
-        self.rank = [0] * n
+        # Templates copied in by reset() so it allocates nothing.
+        self._identity = array('i', range(n))
+        self._zeros = bytes(n)
+        self.parent = array('i', self._identity)
+        self.rank = bytearray(self._zeros)
+
+    def reset(self):
+        self.parent[:] = self._identity
+        self.rank[:] = self._zeros
 
     def find(self, x):
         while self.parent[x] != x:
@@ -78,61 +145,298 @@ class UnionFindSplitting:
         return x
 
     def union(self, x, y):
-        rootX = self.find(x)
-        rootY = self.find(y)
-        if rootX == rootY:
+        parent = self.parent
+        # Nodes that share an immediate parent are already in the same set.
+        if parent[x] == parent[y]:
+            return
+        # Inline both path-splitting walks; x and y end at their roots.
+        while parent[x] != x:
+            temp = x
+            x = parent[x]
+            parent[temp] = parent[x]
+        while parent[y] != y:
+            temp = y
+            y = parent[y]
+            parent[temp] = parent[y]
+        if x == y:
             return
-        if self.rank[rootX] < self.rank[rootY]:
-            self.parent[rootX] = rootY
-        elif self.rank[rootX] > self.rank[rootY]:
-            self.parent[rootY] = rootX
+        rank = self.rank
+        if rank[x] < rank[y]:
+            parent[x] = y
+        elif rank[x] > rank[y]:
+            parent[y] = x
         else:
-            self.parent[rootY] = rootX
-            self.rank[rootX] += 1
+            parent[y] = x
+            rank[x] += 1
 
 
-####################################
-# Workload Generation and Running  #
-####################################
+class UnionFindHalvingSize:
+    """Union‐Find with path halving and union by size instead of rank."""
 
+    def __init__(self, n):
+        # Templates copied in by reset() so it allocates nothing.
+        self._identity = array('i', range(n))
+        self._ones = array('i', [1]) * n
+        self.parent = array('i', self._identity)
+        self.size = array('i', self._ones)
+
+    def reset(self):
+        self.parent[:] = self._identity
+        self.size[:] = self._ones
+
+    def find(self, x):
+        while self.parent[x] != x:
+            # Point x to its grandparent.
+            self.parent[x] = self.parent[self.parent[x]]
+            x = self.parent[x]
+        return x
+
+    def union(self, x, y):
+        parent = self.parent
+        # Nodes that share an immediate parent are already in the same set.
+        if parent[x] == parent[y]:
+            return
+        # Inline both path-halving walks; x and y end at their roots.
+        while parent[x] != x:
+            parent[x] = parent[parent[x]]
+            x = parent[x]
+        while parent[y] != y:
+            parent[y] = parent[parent[y]]
+            y = parent[y]
+        if x == y:
+            return
+        # Link the smaller tree's root under the larger tree's root.
+        size = self.size
+        if size[x] < size[y]:
+            parent[x] = y
+            size[y] += size[x]
+        else:
+            parent[y] = x
+            size[x] += size[y]
+
+    def component_size(self, x):
+        return self.size[self.find(x)]
+
+
+class UnionFindHalvingNP:
+    """Union‐Find with path halving over NumPy int32 parent and int8 rank arrays."""
+
+    def __init__(self, n):
+        # Template copied in by reset() so it allocates nothing.
+        self._identity = np.arange(n, dtype=np.int32)
+        self.parent = self._identity.copy()
+        self.rank = np.zeros(n, dtype=np.int8)
+
+    def reset(self):
+        np.copyto(self.parent, self._identity)
+        self.rank.fill(0)
+
+    def find(self, x):
+        parent = self.parent
+        while True:
+            # Convert to int so the loop works on Python ints, not NumPy scalars.
+            p = int(parent[x])
+            if p == x:
+                return x
+            # Point x to its grandparent.
+            gp = int(parent[p])
+            parent[x] = gp
+            x = gp
+
+    def union(self, x, y):
+        parent = self.parent
+        # Nodes that share an immediate parent are already in the same set.
+        if parent[x] == parent[y]:
+            return
+        # Inline both path-halving walks on Python ints; x and y end at their roots.
+        while True:
+            p = int(parent[x])
+            if p == x:
+                break
+            gp = int(parent[p])
+            parent[x] = gp
+            x = gp
+        while True:
+            p = int(parent[y])
+            if p == y:
+                break
+            gp = int(parent[p])
+            parent[y] = gp
+            y = gp
+        if x == y:
+            return
+        rank = self.rank
+        if rank[x] < rank[y]:
+            parent[x] = y
+        elif rank[x] > rank[y]:
+            parent[y] = x
+        else:
+            parent[y] = x
+            rank[x] += 1
 
-def generate_workload(union_ratio, n, total_ops):
-    """
-    Generates a list of operations.
-    Each operation is a tuple:
-      ("union", a, b)  or  ("find", a)
-    union_ratio is the fraction of operations that are unions.
-    The remaining operations are finds.
-    """
-    union_count = int(total_ops * union_ratio)
-    find_count = total_ops - union_count
-    ops = []
 
-    # Generate union operations.
-    for _ in range(union_count):
-        a = random.randint(0, n - 1)
-        b = random.randint(0, n - 1)
-        ops.append(('union', a, b))
+###################################
+# Numba‐Compiled Implementations #
+###################################
 
-    # Generate find operations.
-    for _ in range(find_count):
-        a = random.randint(0, n - 1)
-        ops.append(('find', a))
 
-    # Shuffle to mix the operations.
-    random.shuffle(ops)
-    return ops
+@njit(cache=True, boundscheck=False)
+def find_halving(parent, x):
+    while parent[x] != x:
+        parent[x] = parent[parent[x]]
+        x = parent[x]
+    return x
 
 
-def run_workload(uf, operations):
+@njit(cache=True, boundscheck=False)
+def find_splitting(parent, x):
+    while parent[x] != x:
+        temp = x
+        x = parent[x]
+        parent[temp] = parent[x]
+    return x
+
+
+@njit(cache=True, boundscheck=False)
+def link_by_rank(parent, rank, rootX, rootY):
+    if rootX == rootY:
+        return
+    if rank[rootX] < rank[rootY]:
+        parent[rootX] = rootY
+    elif rank[rootX] > rank[rootY]:
+        parent[rootY] = rootX
+    else:
+        parent[rootY] = rootX
+        rank[rootX] += 1
+
+
+@njit(cache=True, boundscheck=False)
+def union_halving(parent, rank, x, y):
+    link_by_rank(parent, rank, find_halving(parent, x), find_halving(parent, y))
+
+
+@njit(cache=True, boundscheck=False)
+def union_splitting(parent, rank, x, y):
+    link_by_rank(parent, rank, find_splitting(parent, x), find_splitting(parent, y))
+
+
+@njit(cache=True, boundscheck=False)
+def run_halving(parent, rank, unions_a, unions_b, finds_a):
+    for i in range(unions_a.shape[0]):
+        union_halving(parent, rank, unions_a[i], unions_b[i])
+    for i in range(finds_a.shape[0]):
+        find_halving(parent, finds_a[i])
+
+
+@njit(cache=True, boundscheck=False)
+def run_splitting(parent, rank, unions_a, unions_b, finds_a):
+    for i in range(unions_a.shape[0]):
+        union_splitting(parent, rank, unions_a[i], unions_b[i])
+    for i in range(finds_a.shape[0]):
+        find_splitting(parent, finds_a[i])
+
+
+class UnionFindHalvingJIT:
+    """Union‐Find with path halving, compiled with Numba over NumPy arrays."""
+
+    def __init__(self, n):
+        # Template copied in by reset() so it allocates nothing.
+        self._identity = np.arange(n, dtype=np.int32)
+        self.parent = self._identity.copy()
+        self.rank = np.zeros(n, dtype=np.int8)
+
+    def reset(self):
+        np.copyto(self.parent, self._identity)
+        self.rank.fill(0)
+
+    def find(self, x):
+        return find_halving(self.parent, x)
+
+    def union(self, x, y):
+        union_halving(self.parent, self.rank, x, y)
+
+    def run_ops(self, unions_a, unions_b, finds_a):
+        run_halving(self.parent, self.rank, unions_a, unions_b, finds_a)
+
+
+class UnionFindSplittingJIT:
+    """Union‐Find with path splitting, compiled with Numba over NumPy arrays."""
+
+    def __init__(self, n):
+        # Template copied in by reset() so it allocates nothing.
+        self._identity = np.arange(n, dtype=np.int32)
+        self.parent = self._identity.copy()
+        self.rank = np.zeros(n, dtype=np.int8)
+
+    def reset(self):
+        np.copyto(self.parent, self._identity)
+        self.rank.fill(0)
+
+    def find(self, x):
+        return find_splitting(self.parent, x)
+
+    def union(self, x, y):
+        union_splitting(self.parent, self.rank, x, y)
+
+    def run_ops(self, unions_a, unions_b, finds_a):
+        run_splitting(self.parent, self.rank, unions_a, unions_b, finds_a)
+
+
+####################################
+# Workload Generation and Running  #
+####################################
+
+
+def generate_workloads(scenarios, n, total_ops, rng):
+    """
+    Generates the operations for every scenario from one shared stream.
+    Returns a dict mapping each scenario name to three int32 NumPy arrays:
+      unions_a, unions_b  operands of the union operations
+      finds_a             operands of the find operations
+    scenarios maps names to union ratios, the probability that an operation
+    is a union. Operands for all scenarios are drawn in a single bulk call
+    and each scenario takes its own slice, partitioned by a random union
+    mask so the union:find mix is preserved without interleaving.
+    """
+    count = len(scenarios) * total_ops
+    all_a = rng.integers(0, n, count, dtype=np.int32)
+    all_b = rng.integers(0, n, count, dtype=np.int32)
+    all_r = rng.random(count)
+    workloads = {}
+    for k, (scenario, union_ratio) in enumerate(scenarios.items()):
+        part = slice(k * total_ops, (k + 1) * total_ops)
+        a = all_a[part]
+        b = all_b[part]
+        is_union = all_r[part] < union_ratio
+        workloads[scenario] = (a[is_union], b[is_union], a[~is_union])
+    return workloads
+
+
+def run_workload(uf, unions_a, unions_b, finds_a):
+    """
+    Executes the operations on the given union-find instance uf: all unions
+    first and then all finds, each in its own branch-free loop.
+    Compiled variants run the whole workload in a single run_ops() call.
     """
-    Executes the list of operations on the given union-find instance uf.
+    if hasattr(uf, 'run_ops'):
+        uf.run_ops(unions_a, unions_b, finds_a)
+        return
+    # Bind the methods once so the loops skip the per-op attribute lookup.
+    union = uf.union
+    for x, y in zip(unions_a.tolist(), unions_b.tolist()):
+        union(x, y)
+    find = uf.find
+    for x in finds_a.tolist():
+        find(x)
+
+
+def time_workload(uf, unions_a, unions_b, finds_a):
     """
-    for op in operations:
-        if op[0] == 'union':
-            uf.union(op[1], op[2])
-        elif op[0] == 'find':
-            uf.find(op[1])
+    Returns the wall-clock seconds taken by run_workload on uf.
+    """
+    start = time.perf_counter()
+    run_workload(uf, unions_a, unions_b, finds_a)
+    return time.perf_counter() - start
 
 
 ###############################
@@ -141,7 +445,15 @@ def run_workload(uf, operations):
 
 
 def main():
+    parser = argparse.ArgumentParser(description='Benchmark union-find strategies.')
+    parser.add_argument(
+        '--no-plot', action='store_true', help='skip plotting the results'
+    )
+    args = parser.parse_args()
+
     # Parameters for the simulation.
+    # Every strategy is iterative, so n can be raised (e.g. to 10**6) to study
+    # larger regimes without hitting the recursion limit.
     n = 10000  # Number of elements in Union-Find.
     total_ops = 100000  # Total number of operations per workload.
 
@@ -159,35 +471,62 @@ def main():
         'Full': UnionFindFull,
         'Halving': UnionFindHalving,
         'Splitting': UnionFindSplitting,
+        'Halving Size': UnionFindHalvingSize,
+        'Halving NP': UnionFindHalvingNP,
     }
+    if HAVE_NUMBA:
+        variants['Halving JIT'] = UnionFindHalvingJIT
+        variants['Splitting JIT'] = UnionFindSplittingJIT
+    else:
+        print('numba is not installed; skipping the JIT variants.')
 
     # For reproducibility, fix the random seed.
-    random.seed(42)
+    rng = np.random.default_rng(42)
+
+    # Allocate each variant once and reset it in place before every run.
+    instances = {name: uf_class(n) for name, uf_class in variants.items()}
 
     # Dictionary to hold the results:
     # results[scenario][variant] = duration in seconds.
     results = {scenario: {} for scenario in scenarios}
 
-    # For each scenario, generate a fixed workload and run all variants on it.
-    for scenario, union_ratio in scenarios.items():
+    # Generate a fixed workload for every scenario up front.
+    workloads = generate_workloads(scenarios, n, total_ops, rng)
+
+    # The first call into a compiled kernel either compiles it or, since the
+    # kernels use cache=True, loads it from the on-disk cache in __pycache__;
+    # only the very first run of the script compiles. Time that cold call once
+    # per compiled variant on the first workload so every run below is warm.
+    # cold_results[variant] = duration in seconds.
+    cold_results = {}
+    first_scenario, first_workload = next(iter(workloads.items()))
+    for variant_name, uf in instances.items():
+        if hasattr(uf, 'run_ops'):
+            uf.reset()
+            cold_results[variant_name] = time_workload(uf, *first_workload)
+    if cold_results:
+        print(f'Cold start (compile or cache load): {first_scenario}')
+        for variant_name, duration in cold_results.items():
+            print(f'  {variant_name:13s}: {duration:.4f} seconds (cold)')
+
+    # For each scenario, run all variants on its workload.
+    for scenario, (unions_a, unions_b, finds_a) in workloads.items():
         print(f'Running workload: {scenario}')
-        # Generate the operation sequence for this scenario.
-        ops = generate_workload(union_ratio, n, total_ops)
-
-        for variant_name, uf_class in variants.items():
-            # Create a new instance for each run.
-            uf = uf_class(n)
-            start = time.perf_counter()
-            run_workload(uf, ops)
-            duration = time.perf_counter() - start
+
+        for variant_name, uf in instances.items():
+            uf.reset()
+            duration = time_workload(uf, unions_a, unions_b, finds_a)
             results[scenario][variant_name] = duration
-            print(f'  {variant_name:8s}: {duration:.4f} seconds')
+            print(f'  {variant_name:13s}: {duration:.4f} seconds')
 
     # Display the results in a grouped bar chart.
-    plot_results(results, list(variants.keys()))
+    if not args.no_plot:
+        plot_results(results, list(variants.keys()))
 
 
 def plot_results(results, variant_names):
+    import matplotlib.pyplot as plt
+
     # Extract the scenario names.
     scenarios = list(results.keys())
     num_scenarios = len(scenarios)
@@ -201,8 +540,8 @@ def plot_results(results, variant_names):
 
     # Set up the bar chart.
     x = np.arange(num_scenarios)  # the label locations
-    width = 0.25  # the width of the bars
-    fig, ax = plt.subplots(figsize=(8, 6))
+    width = 0.8 / num_variants  # the width of the bars
+    fig, ax = plt.subplots(figsize=(10, 6))
 
     # Create one set of bars for each variant.
     for i, variant in enumerate(variant_names):
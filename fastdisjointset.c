@@ -14,6 +14,7 @@
 #include <Python.h>
 #include <structmember.h>
 #include <stdlib.h>
+#include <string.h>
 
 #ifndef DISJOINTSET_VERSION
 #define DISJOINTSET_VERSION "1.0.3"
@@ -107,6 +108,28 @@ static int static_find(StaticDisjointSetObject *self, Py_ssize_t x) {
     return x;
 }
 
+/* Helper: merge the sets containing x and y using union by rank and return
+ * the representative of the merged set */
+static int static_union(StaticDisjointSetObject *self, Py_ssize_t x, Py_ssize_t y) {
+    int rootX = static_find(self, x);
+    int rootY = static_find(self, y);
+    if (rootX == rootY) {
+        return rootX;
+    }
+    if (self->rank[rootX] < self->rank[rootY]) {
+        self->parent[rootX] = rootY;
+        return rootY;
+    }
+    else if (self->rank[rootX] > self->rank[rootY]) {
+        self->parent[rootY] = rootX;
+    }
+    else {
+        self->parent[rootY] = rootX;
+        self->rank[rootX] += 1;
+    }
+    return rootX;
+}
+
 static PyObject *
 StaticDS_find(StaticDisjointSetObject *self, PyObject *args)
 {
@@ -132,21 +155,7 @@ StaticDS_union(StaticDisjointSetObject *self, PyObject *args)
         PyErr_SetString(PyExc_IndexError, "index out of range");
         return NULL;
     }
-    int rootX = static_find(self, x);
-    int rootY = static_find(self, y);
-    if (rootX == rootY) {
-        Py_RETURN_NONE;
-    }
-    if (self->rank[rootX] < self->rank[rootY]) {
-        self->parent[rootX] = rootY;
-    }
-    else if (self->rank[rootX] > self->rank[rootY]) {
-        self->parent[rootY] = rootX;
-    }
-    else {
-        self->parent[rootY] = rootX;
-        self->rank[rootX] += 1;
-    }
+    static_union(self, x, y);
     Py_RETURN_NONE;
 }
 
@@ -168,6 +177,114 @@ StaticDS_match(StaticDisjointSetObject *self, PyObject *args)
         Py_RETURN_FALSE;
 }
 
+/* Helper: check a buffer format string against the accepted type codes,
+ * allowing a byte-order prefix only when it denotes native order */
+static int
+ops_format_ok(const char *format, const char *accepted)
+{
+    if (format == NULL)
+        format = "B";
+#if PY_LITTLE_ENDIAN
+    if (*format == '@' || *format == '=' || *format == '<')
+#else
+    if (*format == '@' || *format == '=' || *format == '>' || *format == '!')
+#endif
+        format++;
+    return format[0] != '\0' && format[1] == '\0' && strchr(accepted, format[0]) != NULL;
+}
+
+/* Helper: get a contiguous one-dimensional buffer with the given item size and type */
+static int
+get_ops_buffer(PyObject *obj, Py_buffer *view, Py_ssize_t itemsize, const char *accepted,
+               const char *name, const char *kind)
+{
+    if (PyObject_GetBuffer(obj, view, PyBUF_C_CONTIGUOUS | PyBUF_FORMAT) < 0)
+        return -1;
+    if (view->ndim != 1 || view->itemsize != itemsize || !ops_format_ok(view->format, accepted)) {
+        PyErr_Format(PyExc_TypeError,
+                     "%s must be a one-dimensional contiguous buffer of %s", name, kind);
+        PyBuffer_Release(view);
+        return -1;
+    }
+    return 0;
+}
+
+/*
+ * Helper: apply bulk operations. codes holds one byte per operation and a, b hold
+ * C ints. A nonzero codes[i] means union(a[i], b[i]) and zero means find(a[i]).
+ * roots[i] receives the representative of a[i]'s set after operation i.
+ * All indices are validated before any operation is applied.
+ */
+static int
+static_run_ops(StaticDisjointSetObject *self, Py_buffer *codes_view,
+               Py_buffer *a_view, Py_buffer *b_view, int *roots)
+{
+    Py_ssize_t count = codes_view->len;
+    const char *codes = (const char *)codes_view->buf;
+    const int *a = (const int *)a_view->buf;
+    const int *b = (const int *)b_view->buf;
+    if (a_view->len / a_view->itemsize != count || b_view->len / b_view->itemsize != count) {
+        PyErr_SetString(PyExc_ValueError, "codes, a and b must have the same length");
+        return -1;
+    }
+    for (Py_ssize_t i = 0; i < count; i++) {
+        if (a[i] < 0 || a[i] >= self->n || (codes[i] && (b[i] < 0 || b[i] >= self->n))) {
+            PyErr_SetString(PyExc_IndexError, "index out of range");
+            return -1;
+        }
+    }
+    for (Py_ssize_t i = 0; i < count; i++) {
+        if (codes[i])
+            roots[i] = static_union(self, a[i], b[i]);
+        else
+            roots[i] = static_find(self, a[i]);
+    }
+    return 0;
+}
+
+static PyObject *
+StaticDS_run_ops(StaticDisjointSetObject *self, PyObject *args)
+{
+    PyObject *codes_obj, *a_obj, *b_obj;
+    Py_buffer codes_view, a_view, b_view;
+    if (!PyArg_ParseTuple(args, "OOO", &codes_obj, &a_obj, &b_obj))
+        return NULL;
+    /* 'l' is accepted for a and b where long is the same size as int. */
+    const char *int_formats = sizeof(long) == sizeof(int) ? "il" : "i";
+    if (get_ops_buffer(codes_obj, &codes_view, 1, "bBc?", "codes", "bytes") < 0)
+        return NULL;
+    if (get_ops_buffer(a_obj, &a_view, sizeof(int), int_formats, "a", "C ints") < 0) {
+        PyBuffer_Release(&codes_view);
+        return NULL;
+    }
+    if (get_ops_buffer(b_obj, &b_view, sizeof(int), int_formats, "b", "C ints") < 0) {
+        PyBuffer_Release(&codes_view);
+        PyBuffer_Release(&a_view);
+        return NULL;
+    }
+    /* The roots are written into a bytes object and returned through a
+     * memoryview cast to C ints, so no array module or NumPy is needed. */
+    PyObject *roots = PyBytes_FromStringAndSize(NULL, codes_view.len * (Py_ssize_t)sizeof(int));
+    int status = -1;
+    if (roots)
+        status = static_run_ops(self, &codes_view, &a_view, &b_view,
+                                (int *)PyBytes_AS_STRING(roots));
+    PyBuffer_Release(&codes_view);
+    PyBuffer_Release(&a_view);
+    PyBuffer_Release(&b_view);
+    if (status < 0) {
+        Py_XDECREF(roots);
+        return NULL;
+    }
+    PyObject *view = PyMemoryView_FromObject(roots);
+    Py_DECREF(roots);
+    if (!view)
+        return NULL;
+    PyObject *result = PyObject_CallMethod(view, "cast", "s", "i");
+    Py_DECREF(view);
+    return result;
+}
+
 static PyObject *
 StaticDS_sets(StaticDisjointSetObject *self, PyObject *Py_UNUSED(ignored))
 {
@@ -266,6 +383,11 @@ static PyMethodDef StaticDS_methods[] = {
      "match(x, y): Return True if x and y are in the same set."},
     {"sets", (PyCFunction)StaticDS_sets, METH_NOARGS,
      "sets(): Return a frozenset of sets of connected nodes."},
+    {"run_ops", (PyCFunction)StaticDS_run_ops, METH_VARARGS,
+     "run_ops(codes, a, b): Apply a batch of operations: union(a[i], b[i]) where\n"
+     "codes[i] is nonzero, else find(a[i]). codes is a bytes-like buffer and a, b\n"
+     "are buffers of C ints (e.g. array('i') or an int32 NumPy array). Return a\n"
+     "memoryview of C ints holding the representative of a[i] after operation i."},
     {NULL}
 };
 
@@ -352,21 +474,40 @@ DynamicDS_find(DynamicDisjointSetObject *self, PyObject *args)
         return x;
     }
 
-    /* Path splitting: update visited nodes along the find path */
+    /* Path splitting: update visited nodes along the find path.
+     * x is an owned reference while walking: replacing parent[x] below may
+     * release the dict's only reference to par, which becomes the next x. */
+    Py_INCREF(x);
     while (1) {
         PyObject *par = PyDict_GetItem(self->parent, x);  /* borrowed ref */
+        if (par == NULL) {
+            /* PyDict_GetItem does not set an exception on a miss. */
+            PyErr_SetString(PyExc_RuntimeError, "node missing from parent mapping");
+            Py_DECREF(x);
+            return NULL;
+        }
         int is_root = PyObject_RichCompareBool(par, x, Py_EQ);
-        if (is_root < 0)
+        if (is_root < 0) {
+            Py_DECREF(x);
             return NULL;
+        }
         if (is_root == 1) {
-            Py_INCREF(x);
             return x;
         }
         PyObject *grand = PyDict_GetItem(self->parent, par); /* borrowed ref */
-        if (grand == NULL)
+        if (grand == NULL) {
+            /* PyDict_GetItem does not set an exception on a miss. */
+            PyErr_SetString(PyExc_RuntimeError, "node missing from parent mapping");
+            Py_DECREF(x);
             return NULL;
-        if (PyDict_SetItem(self->parent, x, grand) < 0)
+        }
+        Py_INCREF(par);
+        if (PyDict_SetItem(self->parent, x, grand) < 0) {
+            Py_DECREF(par);
+            Py_DECREF(x);
             return NULL;
+        }
+        Py_DECREF(x);
         x = par;
     }
     Py_RETURN_NONE;
@@ -1,6 +1,14 @@
+import random
 import unittest
+from array import array
 import fastdisjointset
 
+
+def canon(sets):
+    """Return the groups of sets as a sorted list of sorted lists."""
+    return sorted(sorted(s) for s in sets)
+
+
 ###############################################################################
 # Test cases for the StaticDisjointSet (when constructed with an integer n)
 ###############################################################################
@@ -46,31 +54,58 @@ class TestStaticDisjointSet(unittest.TestCase):
         )
 
     def test_sets(self):
-        expected_initial = frozenset(
-            [
-                frozenset([0]),
-                frozenset([1]),
-                frozenset([2]),
-                frozenset([3]),
-                frozenset([4]),
-            ]
-        )
+        self.assertIsInstance(self.ds.sets(), frozenset)
+        expected_initial = [[0], [1], [2], [3], [4]]
         self.assertEqual(
-            self.ds.sets(),
-            expected_initial,
+            canon(self.ds.sets()),
+            canon(expected_initial),
             msg='Initial grouping should have each element in its own set.',
         )
 
         self.ds.union(0, 1)
         self.ds.union(1, 2)
         self.ds.union(3, 4)
-        expected_groups = frozenset([frozenset([0, 1, 2]), frozenset([3, 4])])
+        expected_groups = [[0, 1, 2], [3, 4]]
         self.assertEqual(
-            self.ds.sets(),
-            expected_groups,
+            canon(self.ds.sets()),
+            canon(expected_groups),
             msg='Sets grouping did not match expected groups after unions.',
         )
 
+    def test_run_ops(self):
+        # Opcode 1 is union(a[i], b[i]); opcode 0 is find(a[i]).
+        roots = self.ds.run_ops(
+            bytes([1, 1, 0, 1]), array('i', [0, 1, 2, 3]), array('i', [1, 2, 0, 4])
+        )
+        self.assertEqual(
+            list(roots),
+            [self.ds.find(0)] * 3 + [self.ds.find(3)],
+            msg='run_ops should return the representative after each operation.',
+        )
+        expected_groups = [[0, 1, 2], [3, 4]]
+        self.assertEqual(
+            canon(self.ds.sets()),
+            canon(expected_groups),
+            msg='Bulk operations should match the equivalent union calls.',
+        )
+
+    def test_run_ops_errors(self):
+        with self.assertRaises(IndexError):
+            self.ds.run_ops(bytes([1, 1]), array('i', [0, 1]), array('i', [1, 5]))
+        self.assertFalse(
+            self.ds.match(0, 1),
+            msg='No operation should be applied when an index is out of range.',
+        )
+        with self.assertRaises(ValueError):
+            self.ds.run_ops(bytes([1]), array('i', [0, 1]), array('i', [1, 2]))
+        with self.assertRaises(TypeError):
+            self.ds.run_ops(bytes([1]), array('q', [0]), array('q', [1]))
+        with self.assertRaises(TypeError):
+            self.ds.run_ops(bytes([1]), array('f', [0.0]), array('f', [1.0]))
+        zero_dim = memoryview(array('i', [0])).cast('B').cast('i', shape=[])
+        with self.assertRaises(TypeError):
+            self.ds.run_ops(bytes([0]), zero_dim, zero_dim)
+
 
 ###############################################################################
 # Test cases for the DynamicDisjointSet (when constructed with n=None or no argument)
@@ -114,22 +149,39 @@ class TestDynamicDisjointSet(unittest.TestCase):
         for k in keys:
             self.ds.find(k)
 
-        expected_initial = frozenset({frozenset([k]) for k in keys})
+        expected_initial = [[k] for k in keys]
         self.assertEqual(
-            self.ds.sets(),
-            expected_initial,
+            canon(self.ds.sets()),
+            canon(expected_initial),
             msg='Each key should initially be its own set.',
         )
 
         self.ds.union('x', 'y')
         self.ds.union('z', 'w')
-        expected_groups = frozenset([frozenset(['x', 'y']), frozenset(['z', 'w'])])
+        expected_groups = [['x', 'y'], ['z', 'w']]
         self.assertEqual(
-            self.ds.sets(),
-            expected_groups,
+            canon(self.ds.sets()),
+            canon(expected_groups),
             msg='Dynamic sets grouping did not match expected groups after unions.',
         )
 
+    def test_many_integer_unions(self):
+        # Large ints are distinct objects, so path splitting can drop the last
+        # reference to a parent while find is still walking through it. The
+        # operands are not kept alive here so that such a bug reads freed
+        # memory. That only crashes reliably under PYTHONMALLOC=debug, which
+        # tox sets.
+        rng = random.Random(0)
+        for _ in range(1000):
+            self.ds.union(rng.randrange(1000, 2000), rng.randrange(1000, 2000))
+        rng = random.Random(0)
+        for _ in range(1000):
+            x, y = rng.randrange(1000, 2000), rng.randrange(1000, 2000)
+            self.assertTrue(
+                self.ds.match(x, y),
+                msg=f'Elements {x} and {y} should be connected after union.',
+            )
+
     def test_repeated_union(self):
         self.ds.union('a', 'b')
         self.ds.union('a', 'b')